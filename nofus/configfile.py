@@ -119,15 +119,114 @@ if (cf.load()) {
 
     subscopes = cf.enumerate_scope("sql.maria.auth"); # return array of ['server','user','pw','db']
 """
+import collections
+import functools
 import os
 import re
+import stat
 from collections.abc import Mapping
 
+# Key under which a scope node holds the values of the variable sharing the node's full name
+_VALUES = None
+
+def _copy_scope(node, scope_delimiter):
+    """
+    Copy the scopes and variables below a scope node. Value lists are shared, not copied.
+    :param node dict The node of the scope to copy
+    :param scope_delimiter string The delimiter between the parts of a full name
+    :return tuple The copied node, and a (full name relative to the scope, copied node) pair for
+        each of its variables
+    """
+    copied = {}
+    names = []
+    # walk with a stack rather than recursion, so even a very deep name cannot overflow
+    # the scope itself has no name; None rather than "", as a name part may be empty
+    stack = [(None, node, copied)]
+    while stack:
+        prefix, source, target = stack.pop()
+        for name, child in source.items():
+            if name is _VALUES:
+                # the values of the scope itself are not part of the copy
+                if prefix is not None:
+                    target[name] = child
+                    names.append((prefix, target))
+            else:
+                target[name] = {}
+                full_name = name if prefix is None else prefix + scope_delimiter + name
+                stack.append((full_name, child, target[name]))
+    return copied, names
+
+
+_PatternSet = collections.namedtuple('_PatternSet', ['unescape_re', 'token_re'])
+
+
+@functools.lru_cache(maxsize=32)
+def _build_patterns(comment_starts, var_val_delimiter, scope_delimiter, quote_char, escape_char,
+                    scope_char_set, varname_char_set):
+    """
+    Build the regular expressions used while parsing for the given parse values. Cached, so
+    ConfigFile instances with the same parse values share the same compiled patterns.
+    :return _PatternSet The compiled patterns
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    esc_delim = re.escape(var_val_delimiter)
+    esc_quote = re.escape(quote_char)
+    esc_escape = re.escape(escape_char)
+    scope_char = re.escape(scope_delimiter)
+    # with no comment starts, the alternation must never match (rather than match anywhere)
+    esc_comment_alt = "|".join(map(re.escape, comment_starts)) or "(?!)"
+
+    # Classifies a whole line in a single match. Whitespace must not cross line boundaries,
+    # as the pattern is used with MULTILINE.
+    wsp = r'[^\S\n]*'
+    comment = fr'(?:{esc_comment_alt})[^\n]*'
+    scope_name = fr'[{scope_char_set}]+(?:{scope_char}[{scope_char_set}]+)*'
+    var_name = fr'[{varname_char_set}]+(?:{scope_char}[{varname_char_set}]+)*'
+    # most values have no quote, escape or comment characters; match those in one run
+    specials = "".join(
+        re.escape(chars[0]) for chars in [quote_char, escape_char, *comment_starts] if chars
+    )
+    plain = fr'(?P<plain>[^{specials}\n]*)$'
+    # quoted content as runs of normal chars separated by escape sequences; each char can
+    # only be matched one way, so there is no lookbehind and no backtracking between them
+    normal = fr'[^{re.escape(quote_char[0])}{re.escape(escape_char[0])}\n]*'
+    quoted = fr'{esc_quote}(?P<quoted>{normal}(?:{esc_escape}.{normal})*){esc_quote}' + \
+             fr'{wsp}(?:{comment})?$'
+    # no whitespace run between the lazy value and the comment; two runs that can both
+    # match the same spaces make failing lines quadratic, and the value is stripped anyway
+    value = fr'(?P<value>[^\n]*?)(?:{comment})?'
+    scope_line = fr'(?P<scope>{wsp}\[{wsp}(?:(?P<scope_name>{scope_name}){wsp})?\]{wsp}' + \
+                 fr'(?:{comment})?)'
+    variable_line = fr'(?P<variable>{wsp}(?P<var_name>{var_name}){wsp}' + \
+                    fr'(?:(?P<delim>{esc_delim}){wsp}(?:{plain}|{quoted}|{value})' + \
+                    fr'|{comment})?)'
+    ignore_line = fr'{wsp}(?:(?:{esc_delim}|{esc_comment_alt})[^\n]*)?'
+
+    # For running over an entire file at once; blank and comment lines never match, so
+    # they are skipped inside the regex engine
+    token_pattern = fr'^(?:{scope_line}|{variable_line}' + \
+                    fr'|(?P<invalid>(?!{ignore_line}$)[^\n]+))$'
+
+    return _PatternSet(
+        unescape_re=re.compile(fr'{esc_escape}(.)'),
+        token_re=re.compile(token_pattern, re.MULTILINE),
+    )
+
+
 class ConfigFile:
     """
     The main ConfigFile class
     """
     # pylint: disable=too-many-instance-attributes
+    __slots__ = (
+        'file_path', 'loaded',
+        'line_comment_start', 'var_val_delimiter', 'scope_delimiter', 'quote_char',
+        'escape_char', 'scope_char_set', 'varname_char_set',
+        'current_scope', '_scope_node', '_errors', 'preloaded', 'values', '_order', '_names',
+        '_pat',
+        '__weakref__'
+    )
+
     def __init__(self, file_to_open=None):
         # File Info
         self.file_path = None
@@ -138,12 +237,14 @@ class ConfigFile:
         self.var_val_delimiter = '='
         self.scope_delimiter = '.'
         self.quote_char = '"'
-        self.escape_char = "[\\\\]"
+        self.escape_char = "\\"
         self.scope_char_set = r"a-zA-Z0-9_\-"
         self.varname_char_set = r"a-zA-Z0-9_\-"
 
         # Dynamic parse values
         self.current_scope = ""
+        # (tree root, scope name, node) for the scope variables are currently added to
+        self._scope_node = None
 
         # Errors
         self._errors = []
@@ -151,12 +252,45 @@ class ConfigFile:
         # Keys with preloaded values
         self.preloaded = {}
 
-        # Parsed Content
+        # Parsed Content; a tree of scope nodes, each a dict of child name to child node
         self.values = {}
+        # Full names of variables in the order they were first added, each mapped to its
+        # (position, node) pair
+        self._order = {}
+        # Names added to the tree during a load, so each distinct name is one shared string
+        self._names = None
 
-        # Parse file_to_open
-        if file_to_open is not None and isinstance(file_to_open, str):
-            self.file_path = file_to_open
+        # Compiled parse patterns
+        self._compile_patterns()
+
+        # Parse file_to_open; any path-like (str, bytes or e.g. pathlib.Path) is accepted
+        if isinstance(file_to_open, (str, bytes, os.PathLike)):
+            self.file_path = os.fsdecode(file_to_open)
+
+    def __getstate__(self):
+        """
+        Get the state to pickle or copy; the compiled patterns are left out, as they are
+        rebuilt from the parse values. Includes the slots of any subclasses, and the
+        __dict__ of subclasses without __slots__.
+        :return dict The attribute name=>value pairs to pickle
+        """
+        state = {}
+        for cls in reversed(type(self).__mro__):
+            slots = cls.__dict__.get('__slots__', ())
+            for name in [slots] if isinstance(slots, str) else slots:
+                if name not in ('_pat', '__weakref__', '__dict__') and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore a pickled state, then compile the patterns for its parse values
+        :param state dict The attribute name=>value pairs that were pickled
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._compile_patterns()
 
     def _override_comment_starts(self, line_comment_start):
         """
@@ -167,9 +301,9 @@ class ConfigFile:
                 An array containing strings which indicate the start of a comment
                 OR a string that indicates the start of a comment
         """
-        if not isinstance(line_comment_start, list) and isinstance(line_comment_start, str):
-            self.line_comment_start = [line_comment_start]
-        self.line_comment_start = line_comment_start
+        self.line_comment_start = [line_comment_start] if isinstance(line_comment_start, str) \
+            else list(line_comment_start)
+        self._compile_patterns()
 
     def _override_variable_delimiter(self, var_val_delimiter):
         """
@@ -179,6 +313,7 @@ class ConfigFile:
             name and value
         """
         self.var_val_delimiter = var_val_delimiter
+        self._compile_patterns()
 
     def _override_scope_delimiter(self, scope_delimiter):
         """
@@ -187,6 +322,7 @@ class ConfigFile:
         :param scope_delimiter string The string to indicate the delimiter between scopes
         """
         self.scope_delimiter = scope_delimiter
+        self._compile_patterns()
 
     def _override_quote_character(self, quote_char):
         """
@@ -195,6 +331,7 @@ class ConfigFile:
         :param quote_char string The character to indicate the start and end of a quoted value
         """
         self.quote_char = quote_char
+        self._compile_patterns()
 
     def _override_escape_character(self, escape_char):
         """
@@ -202,7 +339,8 @@ class ConfigFile:
         WARNING: Change this at your own risk. Setting unusual values here may break parsing.
         :param escape_char string The character to indicate an excaped character follows
         """
-        self.escape_char = fr"[{escape_char}]"
+        self.escape_char = escape_char
+        self._compile_patterns()
 
     def _override_scope_characters(self, scope_char_set):
         """
@@ -211,6 +349,7 @@ class ConfigFile:
         :param scope_char_set string A regexp patterns to indicate allowed characters in scope name
         """
         self.scope_char_set = scope_char_set
+        self._compile_patterns()
 
     def _override_variable_name_characters(self, varname_char_set):
         """
@@ -220,6 +359,17 @@ class ConfigFile:
             variable name
         """
         self.varname_char_set = varname_char_set
+        self._compile_patterns()
+
+    def _compile_patterns(self):
+        """
+        Get the regular expressions used while parsing for the current parse values.
+        Must be called again whenever any of the parse values are changed.
+        """
+        self._pat = _build_patterns(
+            tuple(self.line_comment_start), self.var_val_delimiter, self.scope_delimiter,
+            self.quote_char, self.escape_char, self.scope_char_set, self.varname_char_set
+        )
 
     def preload(self, defaults):
         """
@@ -230,12 +380,59 @@ class ConfigFile:
                          OR dict value may also be another dict of values
         """
         for name, value in defaults.items():
-            if not name in self.values:
+            value_type = type(value)
+            # exact type checks first; only fall back to the (slower) abstract Mapping check
+            # for values which are not plain lists or dicts
+            if value_type is dict or (value_type is not list and isinstance(value, Mapping)):
+                self.preload({
+                    name + self.scope_delimiter + sub_name: sub_value
+                    for sub_name, sub_value in value.items()
+                })
+                continue
+            node = self._find_node(name, create=True)
+            if _VALUES not in node:
                 self.preloaded[name] = True
-                if isinstance(value, (list, Mapping)):
-                    self.values[name] = value
+                self._order.setdefault(name, (len(self._order), node))
+                if isinstance(value, list):
+                    node[_VALUES] = value
                 else:
-                    self.values[name] = [value]
+                    node[_VALUES] = [value]
+
+    def _find_node(self, name, create=False, node=None):
+        """
+        Walk the scope tree to the node for a full scope/variable name.
+        :param name string The full name, e.g. "scope.variable"
+        :param create boolean If true, create any missing nodes along the way
+        :param node dict|None The node to walk from; defaults to the root of the tree
+        :return dict|None The node for the name, or None if it does not exist (and create is false)
+        """
+        if node is None:
+            node = self.values
+        for part in name.split(self.scope_delimiter):
+            child = node.get(part)
+            if child is None:
+                if not create:
+                    return None
+                if self._names is not None:
+                    # names repeat across scopes, so share a single string for each in the tree
+                    part = self._names.setdefault(part, part)
+                child = node[part] = {}
+            node = child
+        return node
+
+    def _current_scope_node(self):
+        """
+        Get the node for the current scope, creating it if needed. The node is kept between
+        calls so consecutive variables in a scope do not walk the scope's path again.
+        :return dict The node of the current scope
+        """
+        cached = self._scope_node
+        if cached is None or cached[0] is not self.values or cached[1] != self.current_scope:
+            node = self.values
+            if self.current_scope != "":
+                node = self._find_node(self.current_scope, create=True)
+            cached = self._scope_node = (self.values, self.current_scope, node)
+        return cached[2]
 
     def reset(self):
         """
@@ -243,7 +440,11 @@ class ConfigFile:
         """
         self.loaded = False
         self._errors = []
+        self.preloaded = {}
         self.values = {}
+        self._order = {}
+        self._names = None
+        self._scope_node = None
 
     def load(self):
         """
@@ -260,21 +461,37 @@ class ConfigFile:
                                 "(Note: you cannot load() a query result.)")
             return False
 
-        if not os.path.isfile(self.file_path) or not os.access(self.file_path, os.R_OK):
-            self._errors.append("Cannot load file; file does not exist or is not readable.")
-            return False
-
-        lines = []
+        # just try to open the file; missing or unreadable files fail here
         try:
-            with open(self.file_path, encoding='utf8') as cfile:
-                lines = cfile.readlines()
-        except OSError:
-            self._errors.append("Cannot load file; unknown file error.")
-        lines = [line.rstrip('\r\n') for line in lines]
+            # non-blocking, so opening e.g. a FIFO cannot hang; no effect on regular files
+            fd = os.open(self.file_path, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+            # devices, FIFOs, directories etc. are not config files
+            if not stat.S_ISREG(os.fstat(fd).st_mode):
+                os.close(fd)
+                self._errors.append("Cannot load file; not a regular file.")
+                return False
+            # read as text in one go; universal newlines turn any line ending into "\n"
+            with open(fd, encoding='utf8') as cfile:
+                content = cfile.read()
+        except OSError as err:
+            self._errors.append(f"Cannot load file; {err}")
+            return False
 
-        # Process lines
-        for line_num, line in enumerate(lines):
-            self._process_line(line_num, line)
+        # Process all lines in a single pass; the line number is only needed for errors,
+        # which are rare, so is only counted then, carrying on from the previous error
+        # rather than from the start of the file
+        counted_pos = counted_lines = 0
+        self._names = {}
+        for match in self._pat.token_re.finditer(content):
+            line_num = None
+            if match.lastgroup == 'invalid':
+                start = match.start()
+                counted_lines += content.count('\n', counted_pos, start)
+                counted_pos = start
+                line_num = counted_lines
+            self._process_match(line_num, match)
+        # names only need sharing while they are being added
+        self._names = None
 
         # If parsing lines generated errors, return false
         if len(self._errors) > 0:
@@ -284,311 +501,78 @@ class ConfigFile:
         self.loaded = True
         return True
 
-    def _find_line_comment_position(self, line, search_offset=0):
-        """
-        Find the position of the first line comment (ignoring all other rules)
-        :param line string The line to search over
-        :param search_offset int Offset from start of line in characters to skip before searching
-        :returns int|false The position of line comment start or false if no line comment found
-        """
-        start = False
-        for comment_start in self.line_comment_start:
-            start_check = line.find(comment_start, search_offset)
-            if start_check != -1 and (start is False or start_check < start):
-                start = start_check
-
-        return start
-
-    def _find_assignment_delimiter_position(self, line):
-        """
-        Find the position of the first assignment delimiter (ignoring all other rules)
-        :param line string The line to search over
-        :returns int|false The position of the assignment delimiter or false if no delimiter found
-        """
-        pos = line.find(self.var_val_delimiter)
-        return pos if pos != -1 else False
-
-    def _find_open_quote_position(self, line):
-        """
-        Find the position of the opening double quote character (ignoring all other rules)
-        :param line string The line to search over
-        :returns int|false The position of the double quote, or false is not found
-        """
-        pos = line.find(line, self.quote_char)
-        return pos if pos != -1 else False
-
-    def _is_valid_scope_definition(self, line):
-        """
-        Given a line, check to see if it is a valid scope definition
-        :param line string The line to check
-        :return boolean Returns true if well formed and valid, false otherwise
-        """
-        valid_char_set = self.scope_char_set
-        scope_char = re.escape(self.scope_delimiter)
-        esc_comment_starts = ''
-        for comment_start in self.line_comment_start:
-            if esc_comment_starts != '':
-                esc_comment_starts += '|'
-            esc_comment_starts += re.escape(comment_start)
-
-        scope_pattern = fr'^\s*\[\s*(?:[{valid_char_set}]+' + \
-                        fr'(?:{scope_char}[{valid_char_set}]+)*)?\s*\]' + \
-                        fr'\s*(?:({esc_comment_starts}).*)?$'
-
-        # default to not a scope
-        valid = False
-        # check for validity
-        patt = re.compile(scope_pattern)
-        if patt.search(line):
-            valid = True
-
-        return valid
-
-    def _set_scope(self, line):
-        """
-        Set the current scope (assumes the line is a scope definition) while parsing the file.
-        Does nothing if line is not a scope definition.
-        :param line string The line to get the scope from
-        """
-        valid_char_set = self.scope_char_set
-        scope_char = re.escape(self.scope_delimiter)
-        esc_comment_starts = ''
-        for comment_start in self.line_comment_start:
-            if esc_comment_starts != '':
-                esc_comment_starts += '|'
-            esc_comment_starts += re.escape(comment_start)
-
-        scope_pattern = fr'^\s*\[\s*([{valid_char_set}]+' + \
-                        fr'(?:{scope_char}[{valid_char_set}]+)*)?\s*\]' + \
-                        fr'\s*(?:({esc_comment_starts}).*)?$'
-
-        # check for invalid characters
-        patt = re.compile(scope_pattern)
-        match = patt.search(line)
-        if match and len(match.groups()) == 2:
-            self.current_scope = "" if match.group(1) is None else match.group(1)
-
-    def _has_value_delimiter(self, line):
-        """
-        Check if line has a value delimiter. Can only return true if the line
-        also has a valid variable name.
-        :param line string The line to check against
-        :returns boolean Returns true if line has a delimiter after a valid variable name
-        """
-        has_delim = False
-        if self._has_valid_variable_name(line):
-            esc_delim = re.escape(self.var_val_delimiter)
-            delim_pattern = re.compile(fr'^[^{esc_delim}]+{esc_delim}')
-            match = re.search(delim_pattern, line)
-            if match:
-                has_delim = True
-
-        return has_delim
-
-    def _has_quoted_value(self, line, line_for_error=None):
-        """
-        Checks if the line has a valid quoted value.
-        :param line string $sLine The line to check
-        :param line_for_error int|none If a line number is provided, will add error
-            messages if invalidly quoted
-        :return boolean Returns true if a quoted value exist, false otherwise
-        """
-        # pylint: disable=unused-argument
-        # TODO line_for_error
-        #################################################
-        # - Variable name must be valid
-        # - Assignment delimiter must exist after variable name (allowing for whitespace)
-        # - First character after assignment delimiter must be a quote (allowing for whitespace)
-        # - Assignment delimiter and open quote must not be in a comment
-        # - A matching quote character must exist to close the value
-        # - The closing quote has no other chars are after it (other than whitespace and comments)
-        #################################################
-        quoted_value = False
-        if self._has_valid_variable_name(line):
-            esc_delim = re.escape(self.var_val_delimiter)
-            esc_quote = re.escape(self.quote_char)
-            esc_escape = self.escape_char
-            esc_comment_starts = ""
-
-            for comment_start in self.line_comment_start:
-                if esc_comment_starts != '':
-                    esc_comment_starts += '|'
-                esc_comment_starts += re.escape(comment_start)
-
-            quote_val_patterns = re.compile(fr'^[^{esc_delim}]+{esc_delim}\s*{esc_quote}' + \
-                                            fr'(?:{esc_escape}{esc_quote}|[^{esc_quote}])*' + \
-                                            fr'(?<!{esc_escape}){esc_quote}\s*' + \
-                                            fr'(?:({esc_comment_starts}).*)?$')
-
-            match = quote_val_patterns.search(line)
-            if match and len(match.groups()) == 1:
-                quoted_value = True
-
-        return quoted_value
-
-    def _get_quoted_value(self, line):
-        """
-        Returns the content from inside a properly quoted value string given a whole line.
-        The content from inside the string may still have escaped values.
-        :param line string The line to operate from
-        :return string The value between the opening and closed quote of the value
-            (does NOT include open/closing quotes); on failure, returns empty string.
-        """
-        value = ""
-        if self._has_valid_variable_name(line):
-            esc_delim = re.escape(self.var_val_delimiter)
-            esc_quote = re.escape(self.quote_char)
-            esc_escape = self.escape_char
-            esc_comment_starts = ""
-
-            for comment_start in self.line_comment_start:
-                if esc_comment_starts != '':
-                    esc_comment_starts += '|'
-                esc_comment_starts += re.escape(comment_start)
-
-            quote_val_patterns = re.compile(fr'^[^{esc_delim}]+{esc_delim}\s*{esc_quote}' + \
-                                            fr'((?:{esc_escape}{esc_quote}|[^{esc_quote}])*)' + \
-                                            fr'(?<!{esc_escape}){esc_quote}\s*' + \
-                                            fr'(?:({esc_comment_starts}).*)?$')
-
-            match = quote_val_patterns.search(line)
-            if match and len(match.groups()) == 2:
-                value = match.group(1)
-
-        return value
-
-    def _get_variable_value(self, line, line_for_error=None):
-        """
-        Get the processed value for the given line. Handles quotes, comments,
-            and unescaping characters.
-        :param line string The line to operate from
-        :param line_for_error int|null If a line number is provided, will add error messages
-            if invalidly quoted
-        :return string The value processed variable value
-        """
-        value = False
-        if self._has_valid_variable_name(line):
-            value = True
-            if self._has_value_delimiter(line):
-                value = ""
-                if self._has_quoted_value(line, line_for_error):
-                    # getting the quoted value will strip off comments automatically
-                    value = self._get_quoted_value(line)
-                else:
-                    value = self._get_post_delimiter(line)
-                    # handle comments
-                    comment_start = self._find_line_comment_position(value)
-                    if comment_start is not False:
-                        value = value[0:comment_start]
-                    value = value.strip()
-
-                # handle escaped chars
-                unescape_pattern = fr'{self.escape_char}(.)'
-                unescape_replace = r'\1'
-                value = re.sub(unescape_pattern, unescape_replace, value)
-
-        return value
-
-    def _get_pre_delimiter(self, line):
-        """
-        Returns the trimmed string before any delimiter on a line.
-         - Removes comments from line
-         - If no delimiter is present, returns the whole line (minus any comment)
-        :param line string The line to operate from
-        :return string The value before any delimiter
-        """
-        assign_delim_pos = self._find_assignment_delimiter_position(line)
-        line_comment_pos = self._find_line_comment_position(line)
-
-        # if comment starts before the delimiter, then the delimiter is commented out; ignore it
-        if line_comment_pos is not False and \
-          (assign_delim_pos is False or line_comment_pos < assign_delim_pos):
-            line = line[0:line_comment_pos]
-
-        # if the delimiter exists (non-commented)
-        if assign_delim_pos is not False:
-            line = line[0:assign_delim_pos]
-
-        return line.strip()
-
-    def _get_post_delimiter(self, line):
-        """
-        Returns the trimmed string after any delimiter on a line.
-         - If no delimiter is present (or if delimiter is commented out) returns empty string
-         - Does NOT remove comments from post delimiter content
-        :param line string The line to operate from
-        :return string The value after any delimiter
-        """
-        assign_delim_pos = self._find_assignment_delimiter_position(line)
-
-        # if comment starts before the delimiter, then the delimiter is
-        # commented out; no post delim content
-        if assign_delim_pos is not False:
-            line = line[1+assign_delim_pos:]
-
-        line = line.strip()
-        return line
-
-    def _has_valid_variable_name(self, line, line_for_error=None):
-        """
-        Checks if the line has a variable name and that it's valid
-        :param line string The line to check
-        :param line_for_error int|null If provided, will add an error
-            on invalid variable name characters
-        :return boolean Returns true if variable name exists and is valid, false otherwise
-        """
-        valid_char_set = self.varname_char_set
-        scope_char = re.escape(self.scope_delimiter)
-        var_name_pattern = re.compile(fr'^\s*(?:[{valid_char_set}]+' + \
-                                      fr'(?:{scope_char}[{valid_char_set}]+)*)\s*$')
-        var_name_check = self._get_pre_delimiter(line)
-
-        # default to not a valid name
-        valid = False
-        # check for invalid characters
-        match = var_name_pattern.search(var_name_check)
-        if match:
-            valid = True
-        # don't error for empty line
-        elif var_name_check != "" and line_for_error is not None:
-            self._add_error(line_for_error, "Invalid variable name.")
-
-        return valid
-
-    def _get_variable_name(self, line, line_for_error=None):
-        """
-        Gets a valid variable name for a line, or false if no valid variable name exists.
-        :param line string The line to check
-        :param line_for_error int|null If provided, will add an error
-            on invalid variable name characters
-        :return string|false The variable name, or false if no valid variable name existed
-        """
-        valid_var = False
-        if self._has_valid_variable_name(line, line_for_error):
-            valid_var = self._get_pre_delimiter(line)
-
-        return valid_var
-
-    def _process_line(self, line_num, line):
-        """
-        Process a line into the store values array.
-        :param line_num int The line number processing (for use in error reporting)
-        :param line string The full line from the file to process
-        """
-        if self._is_valid_scope_definition(line):
-            self._set_scope(line)
-        else:
-            var_name = self._get_variable_name(line, line_num)
-            if var_name is not False:
+    def _process_match(self, line_num, match):
+        """
+        Process a line already classified by the token pattern into the store values array.
+        :param line_num int|None The line number processing (for use in error reporting); only
+            given for invalid lines
+        :param match re.Match The token pattern match for the line
+        """
+        kind = match.lastgroup
+        if kind == 'scope':
+            scope = match.group('scope_name')
+            self.current_scope = "" if scope is None else scope
+        elif kind == 'variable':
+            var_name = match.group('var_name')
+            # initialize variable name array if doesn't exist (or if it was a preloaded value)
+            node = self._find_node(var_name, create=True, node=self._current_scope_node())
+            values = node.get(_VALUES)
+            # a preloaded value is replaced on its first occurrence; most files have none
+            if self.preloaded:
                 adjusted_name = self.current_scope + \
                                 ("" if self.current_scope == "" else self.scope_delimiter) + \
                                 var_name
-                # initialize variable name array if doesn't exist (or if it was a preloaded value)
-                if adjusted_name not in self.values or adjusted_name in self.preloaded:
-                    self.values[adjusted_name] = []
-                    if adjusted_name in self.preloaded:
-                        del self.preloaded[adjusted_name]
-                self.values[adjusted_name].append(self._get_variable_value(line, line_num))
+                if self.preloaded.pop(adjusted_name, False):
+                    values = None
+            if values is None:
+                if _VALUES not in node:
+                    # first time this variable is seen; get_all() lists it in this position
+                    full_name = self.current_scope + \
+                                ("" if self.current_scope == "" else self.scope_delimiter) + \
+                                var_name
+                    self._order[full_name] = (len(self._order), node)
+                values = node[_VALUES] = []
+
+            # no delimiter means the variable is simply set
+            value = True
+            if match.group('delim') is not None:
+                value = match.group('plain')
+                if value is not None:
+                    # nothing to unescape or strip comments from
+                    value = value.strip()
+                else:
+                    value = match.group('quoted')
+                    if value is None:
+                        value = match.group('value').strip()
+                    # handle escaped chars
+                    value = self._unescape(value)
+            values.append(value)
+        elif kind == 'invalid':
+            self._add_error(line_num, "Invalid variable name.")
+
+    def _unescape(self, value):
+        """
+        Remove escape characters from a value, keeping the character each one escapes.
+        :param value string The value to unescape
+        :return string The unescaped value
+        """
+        escape_char = self.escape_char
+        if len(escape_char) != 1:
+            return self._pat.unescape_re.sub(r'\1', value)
+
+        pos = value.find(escape_char)
+        if pos == -1:
+            return value
+
+        pieces = []
+        start = 0
+        # an escape char at the very end has nothing to escape, so is kept
+        while pos != -1 and pos + 1 < len(value):
+            pieces.append(value[start:pos])
+            start = pos + 1
+            pos = value.find(escape_char, pos + 2)
+        pieces.append(value[start:])
+        return "".join(pieces)
 
     def _add_error(self, line, message):
         """
@@ -616,25 +600,29 @@ class ConfigFile:
         :return string|ConfigFile|null The matching value from the query, or mDefault if not found
         """
         val = default
-        # try to get value match first
-        if query in self.values and len(self.values[query]) > 0:
-            val = self.values[query][0]
-        else:
-            # check if this matches any scopes
-            scope_char = re.escape(self.scope_delimiter)
-            query_str = re.escape(query)
-            # must match a scope exactly ( "my.scope" should not match "my.scopeless" )
-            scope_pattern = re.compile(fr'^{query_str}{scope_char}(.+)$')
-
-            scope_matches = {}
-            for name, value in self.values.items():
-                match = scope_pattern.search(name)
-                if match and len(match.groups()) == 1:
-                    scope_matches[match.group(1)] = value
-
-            if len(scope_matches) > 0:
-                val = ConfigFile()
-                val.preload(scope_matches)
+        node = self._find_node(query)
+        if node is not None:
+            # try to get value match first
+            values = node.get(_VALUES)
+            if values:
+                val = values[0]
+            else:
+                # check if this matches any scopes; the result gets its own copy of the
+                # scope tree, so changes to it (e.g. preload) do not show up in this config
+                scope_matches, names = _copy_scope(node, self.scope_delimiter)
+                if len(names) > 0:
+                    # pylint: disable=protected-access
+                    val = ConfigFile()
+                    # only rebuild the result's patterns if they would actually differ
+                    if val.scope_delimiter != self.scope_delimiter:
+                        val._override_scope_delimiter(self.scope_delimiter)
+                    val.values = scope_matches
+                    # keep the variables in the order they were added here; names recorded
+                    # before a change of scope delimiter no longer match, so go last
+                    prefix = query + self.scope_delimiter
+                    last = (len(self._order), None)
+                    names.sort(key=lambda entry: self._order.get(prefix + entry[0], last)[0])
+                    val._order = {name: (pos, child) for pos, (name, child) in enumerate(names)}
 
         return val
 
@@ -646,17 +634,15 @@ class ConfigFile:
         :param query string The query string. e.g. "variable", "scope.variable", etc
         :return list A list containing all matching values from the query or empty list if not found
         """
-        val = []
-        if query in self.values:
-            val = self.values[query]
-        return val
+        node = self._find_node(query)
+        return [] if node is None else node.get(_VALUES, [])
 
     def get_all(self):
         """
         Get all name/value pairs that have been parsed from the file.
         :return array An associative array containing name=>value pairs will full scope names.
         """
-        return self.values
+        return {name: node[_VALUES] for name, (_, node) in self._order.items()}
 
     def enumerate_scope(self, query=""):
         """
@@ -665,18 +651,7 @@ class ConfigFile:
         :param query string A scope level to match, or empty string to query for top level scopes
         :return array An array of available scopes/variables for the given scope level
         """
-        scope_values = []
-        all_scopes = self.values.keys()
-        if query != "":
-            query += "."
-        for scope in all_scopes:
-            if query == "" or scope.find(query) == 0:
-                sub_scope = scope[len(query):]
-                scope_end = sub_scope.find(".")
-                val = sub_scope[0:]
-                # Grab only the next level of scope
-                if scope_end != -1:
-                    val = sub_scope[0:scope_end]
-                scope_values.append(val)
-
-        return list(set(scope_values))
+        node = self.values if query == "" else self._find_node(query)
+        if node is None:
+            return []
+        return [name for name in node if name is not _VALUES]
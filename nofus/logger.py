@@ -64,6 +64,7 @@ try:
 except ZeroDivisionError as exc:
     Logger.info("Caught something.", exc_info=exc)
 """
+import atexit
 import os
 import time
 import threading
@@ -101,16 +102,43 @@ class Logger(LoggingInterface):
 
     LOG_RAW       = 0x80000000  # Raw log message; e.g. remove log prefixes
 
+    # Name of each single log level, as written in log entries
+    LEVEL_NAMES = {
+        LOG_CRITICAL: "CRITICAL",
+        LOG_ERROR: "ERROR",
+        LOG_WARNING: "WARNING",
+        LOG_NOTICE: "NOTICE",
+        LOG_INFO: "INFO",
+        LOG_DEBUG: "DEBUG",
+        LOG_TRACE: "TRACE",
+    }
+
     # Instance of class implementing LoggingInterface
     logger = None
     # Threading lock
     nofus_lock = threading.Lock()
+    # Second and formatted timestamp of the most recent log entry
+    timestamp_cache = (None, "")
 
     def __init__(self, log_file=None, log_level=None):
         if log_level is None:
             log_level = Logger.LOG_HIGH
         self.log_file = log_file
         self.log_level = log_level
+        # Open log file, and the (device, inode) it was opened as
+        self.log_handle = None
+        self.log_file_id = None
+        # Once closed, no log file is kept open
+        self.closed = False
+
+    @staticmethod
+    def _set_logger(logger):
+        """
+        Set the logger in use, closing the log file of a built-in logger being replaced
+        """
+        if isinstance(Logger.logger, Logger) and Logger.logger is not logger:
+            Logger.logger.close()
+        Logger.logger = logger
 
     @staticmethod
     def register(logger):
@@ -121,14 +149,14 @@ class Logger(LoggingInterface):
         if not issubclass(logger.__class__, LoggingInterface):
             raise TypeError("Logger failure. "
                 "Can only register classes which implement LoggingInterface.")
-        Logger.logger = logger
+        Logger._set_logger(logger)
 
     @staticmethod
     def disable():
         """
         Unset (disable) the logger
         """
-        Logger.logger = False
+        Logger._set_logger(False)
 
     @staticmethod
     def initialize(log_file, log_level=None):
@@ -142,7 +170,7 @@ class Logger(LoggingInterface):
         can_create_file = not os.path.isfile(log_file) \
                           and os.access(os.path.dirname(log_file), os.W_OK)
         if file_writable or can_create_file:
-            Logger.logger = Logger(log_file, log_level)
+            Logger._set_logger(Logger(log_file, log_level))
         else:
             raise IOError("Logger failure. Can not initialize; log file not writable.")
 
@@ -151,37 +179,75 @@ class Logger(LoggingInterface):
         Default log to file implementation
         """
         if (self.log_level & log_level & Logger.LOG_ALL) != Logger.LOG_NONE:
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            level = "CUSTOM"
-            if log_level == Logger.LOG_CRITICAL:
-                level = "CRITICAL"
-            elif log_level == Logger.LOG_ERROR:
-                level = "ERROR"
-            elif log_level == Logger.LOG_WARNING:
-                level = "WARNING"
-            elif log_level == Logger.LOG_NOTICE:
-                level = "NOTICE"
-            elif log_level == Logger.LOG_INFO:
-                level = "INFO"
-            elif log_level == Logger.LOG_DEBUG:
-                level = "DEBUG"
-            elif log_level == Logger.LOG_TRACE:
-                level = "TRACE"
-
-            rawline = log_level & Logger.LOG_RAW
-            entry = ("" if rawline else f"[{timestamp}] [{level}] ") \
-                    + f"{entry}" + os.linesep
-            with Logger.nofus_lock, open(self.log_file, 'a+', encoding="utf8") as appendlog:
-                appendlog.write(entry)
+            if log_level & Logger.LOG_RAW:
+                entry = f"{entry}{os.linesep}"
+            else:
+                level = Logger.LEVEL_NAMES.get(log_level, "CUSTOM")
+                entry = f"[{Logger._timestamp()}] [{level}] {entry}{os.linesep}"
+            with Logger.nofus_lock:
+                if self.closed:
+                    # nothing would close a handle kept open now, e.g. for an entry from a
+                    # thread that got this logger before it was replaced, or from an atexit
+                    # handler; so append the entry on its own
+                    with open(self.log_file, 'ab') as appendlog:
+                        appendlog.write(entry.encode("utf8"))
+                else:
+                    self._log_handle().write(entry.encode("utf8"))
+
+    def close(self):
+        """
+        Close the log file, if open; any later entries open and close the file for each write
+        """
+        with Logger.nofus_lock:
+            self.closed = True
+            if self.log_handle is not None:
+                self.log_handle.close()
+                self.log_handle = None
+
+    def _log_handle(self):
+        """
+        Get the unbuffered handle log entries are appended to, opening the log file again
+        if it has been moved or deleted since (e.g. by log rotation)
+        """
+        try:
+            stat = os.stat(self.log_file)
+            file_id = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            file_id = None
+        if self.log_handle is None or file_id != self.log_file_id:
+            if self.log_handle is not None:
+                self.log_handle.close()
+            # pylint: disable=consider-using-with
+            self.log_handle = open(self.log_file, 'ab', buffering=0)
+            stat = os.fstat(self.log_handle.fileno())
+            self.log_file_id = (stat.st_dev, stat.st_ino)
+        return self.log_handle
+
+    @staticmethod
+    def _timestamp():
+        """
+        Get the timestamp for a log entry, only formatting it again once the second changes
+        """
+        now = int(time.time())
+        cached = Logger.timestamp_cache
+        if cached[0] != now:
+            cached = Logger.timestamp_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S",
+                                                                  time.localtime(now)))
+        return cached[1]
 
     @staticmethod
     def _process_log(entry, log_level, exc_info=None):
         """
         Handle the log entry, unless logging is disabled
         """
-        if Logger.logger is None:
+        logger = Logger.logger
+        if logger is None:
             raise RuntimeError("Logger failure. Logger not initialized.")
-        if Logger.logger is not False:
+        if logger is not False:
+            # skip levels the built-in logger would filter out anyway, before any formatting
+            # is done; custom loggers only promise make_log(), so they do their own filtering
+            if isinstance(logger, Logger) and (logger.log_level & log_level) == Logger.LOG_NONE:
+                return
             if exc_info:
                 tb_block = os.linesep;
                 for tbline in traceback.format_exception(
@@ -191,7 +257,7 @@ class Logger(LoggingInterface):
                     ):
                     tb_block += tbline
                 entry += tb_block
-            Logger.logger.make_log(entry, log_level)
+            logger.make_log(entry, log_level)
 
     @staticmethod
     def is_enabled(log_level):
@@ -251,3 +317,13 @@ class Logger(LoggingInterface):
         Static logger for trace messages
         """
         Logger._process_log(entry, Logger.LOG_TRACE, exc_info=exc_info)
+
+
+def _close_logger_at_exit():
+    """
+    Close the log file of the built-in logger in use, if any, as the interpreter exits
+    """
+    if isinstance(Logger.logger, Logger):
+        Logger.logger.close()
+
+atexit.register(_close_logger_at_exit)
@@ -1,11 +1,30 @@
+import copy
 import os
+import pathlib
+import pickle
+import tempfile
+import time
 import unittest
+import weakref
 from nofus import ConfigFile
 TEST_PATH = os.path.dirname(os.path.realpath(__file__))
 
+class SlottedConfigFile(ConfigFile):
+    __slots__ = ('extra',)
+
+class PlainConfigFile(ConfigFile):
+    pass
+
 class ConfigFileTestCase(unittest.TestCase):
     def setUp(self):
         self.test1_file = os.path.join(TEST_PATH, "valid1.conf")
+        self.empty_file = os.path.join(TEST_PATH, "empty.conf")
+        self.whitespace_file = os.path.join(TEST_PATH, "whitespace.conf")
+        self.escapes_file = os.path.join(TEST_PATH, "escapes.conf")
+        self.nocomments_file = os.path.join(TEST_PATH, "nocomments.conf")
+        self.comments_file = os.path.join(TEST_PATH, "comments.conf")
+        self.invalid1_file = os.path.join(TEST_PATH, "invalid1.conf")
+        self.deep_file = os.path.join(TEST_PATH, "deep.conf")
 
     def test_can_load_file(self):
         cf = ConfigFile(self.test1_file)
@@ -13,9 +32,27 @@ class ConfigFileTestCase(unittest.TestCase):
         loaded = cf.load()
         if not loaded:
             for error in cf.errors():
-                print(" >> {0}".format(error))
+                print(f" >> {error}")
         self.assertTrue(loaded)
 
+    def test_path_like_file(self):
+        cf = ConfigFile(pathlib.Path(self.test1_file))
+        self.assertEqual(       self.test1_file,                            cf.file_path)
+        self.assertTrue(cf.load())
+
+    def test_empty_file(self):
+        cf = ConfigFile(self.empty_file)
+        self.assertTrue(cf.load())
+        self.assertEqual([], cf.errors())
+        self.assertEqual({}, cf.get_all())
+
+    def test_line_endings_and_unicode_whitespace(self):
+        cf = ConfigFile(self.whitespace_file)
+        self.assertTrue(cf.load())
+        self.assertEqual(       'x',                                        cf.get('var1'))
+        self.assertEqual(       'q',                                        cf.get('var2'))
+        self.assertEqual(       '1',                                        cf.get('var3'))
+
     def test_invalid_file(self):
         cf = ConfigFile("/not/a/valid/path/config.conf")
         self.assertIsInstance(cf, ConfigFile)
@@ -24,6 +61,28 @@ class ConfigFileTestCase(unittest.TestCase):
         self.assertIsInstance(cf.errors(), list)
         self.assertGreater(len(cf.errors()), 0)
 
+    def test_error_line_numbers(self):
+        cf = ConfigFile(self.invalid1_file)
+        self.assertFalse(cf.load())
+        self.assertEqual([
+            "ConfigFile parse error on line 4: Invalid variable name.",
+            "ConfigFile parse error on line 8: Invalid variable name.",
+            "ConfigFile parse error on line 10: Invalid variable name.",
+        ], cf.errors())
+
+    def test_non_regular_file(self):
+        special_files = [os.devnull, TEST_PATH]
+        if hasattr(os, 'mkfifo'):
+            fifo_dir = tempfile.TemporaryDirectory()
+            self.addCleanup(fifo_dir.cleanup)
+            fifo_file = os.path.join(fifo_dir.name, "fifo.conf")
+            os.mkfifo(fifo_file)
+            special_files.append(fifo_file)
+        for special_file in special_files:
+            cf = ConfigFile(special_file)
+            self.assertFalse(cf.load())
+            self.assertEqual(1, len(cf.errors()))
+
     def test_can_parse_all_values(self):
         cf = ConfigFile(self.test1_file)
         cf.preload( { "non-var": "doesn't exist", "var1": "get's overridden" } )
@@ -49,8 +108,10 @@ class ConfigFileTestCase(unittest.TestCase):
         self.assertEqual(       'quoted string # in value',                 cf.get('var8'))
         self.assertEqual(       '"start quoted" but not ended',             cf.get('var9'))
         self.assertEqual(       'special chars # \\\\ = inside string',     cf.get('var10'))
+        self.assertEqual(       'ends with escape \\',                      cf.get('var10b'))
         self.assertEqual(       '',                                         cf.get('var11'))
         self.assertTrue(         cf.get('var12'))
+        self.assertIs(          True,                                       cf.get('var12b'))
         self.assertEqual(       'abc',                                      cf.get('multi-var13'))
         self.assertEqual(       ['abc','pqr','xyz'],                        cf.get_list('multi-var13'))
         self.assertEqual(       'non quoted start with "quoted end"',       cf.get('var14'))
@@ -77,3 +138,118 @@ class ConfigFileTestCase(unittest.TestCase):
         self.assertIsInstance(  cf.get_list('invalid.name'),                list)
         self.assertCountEqual(  cf.get_list('invalid.name'),                [])
 
+
+    def test_long_whitespace_runs(self):
+        spaces = ' ' * 20000
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conf_file = os.path.join(tmp_dir, "spaces.conf")
+            with open(conf_file, 'w', encoding='utf8') as conf:
+                conf.write(f'var1 = "{spaces}x\n[{spaces}x\nvar2 = "a"{spaces}x\n')
+            cf = ConfigFile(conf_file)
+            started = time.perf_counter()
+            self.assertFalse(cf.load())
+            self.assertLess(    time.perf_counter() - started,              1.0)
+        self.assertEqual(       f'"{spaces}x',                              cf.get('var1'))
+        self.assertEqual(       f'"a"{spaces}x',                            cf.get('var2'))
+        self.assertEqual(       1,                                          len(cf.errors()))
+
+    def test_override_escape_character(self):
+        cf = ConfigFile(self.escapes_file)
+        # a regex special character, stored as the plain character
+        cf._override_escape_character("^")
+        self.assertEqual(       '^',                                        cf.escape_char)
+        self.assertTrue(cf.load())
+        self.assertEqual(       'say "hi"',                                 cf.get('var1'))
+        self.assertEqual(       'a^b',                                      cf.get('var2'))
+        self.assertEqual(       'back\\slash',                              cf.get('var3'))
+        self.assertEqual(       'ends with escape ^',                       cf.get('var4'))
+
+    def test_preload_nested_scopes(self):
+        cf = ConfigFile()
+        cf.preload( { "var1": 12, "sql": { "host": "localhost", "auth": { "user": "apache" } } } )
+        self.assertEqual(       12,                                         cf.get('var1'))
+        self.assertEqual(       'localhost',                                cf.get('sql.host'))
+        self.assertEqual(       'apache',                                   cf.get('sql').get('auth.user'))
+        self.assertEqual(       ['auth', 'host'],                           sorted(cf.enumerate_scope('sql')))
+        self.assertEqual(       ['sql.auth.user', 'sql.host', 'var1'],      sorted(cf.get_all()))
+        self.assertEqual(       [],                                         cf.enumerate_scope('nope'))
+
+    def test_scope_result_is_separate(self):
+        cf = ConfigFile()
+        cf.preload( { "sql": { "maria": { "host": "localhost" } } } )
+        cf.get('sql').preload( { "maria.newkey": "leak" } )
+        self.assertIsNone(      cf.get('sql.maria.newkey'))
+        self.assertEqual(       ['host'],                                   cf.enumerate_scope('sql.maria'))
+        cf = ConfigFile()
+        cf.preload( { "a..b": 1, "a.": 2 } )
+        cf_a = cf.get('a')
+        self.assertEqual(       {'.b': [1], '': [2]},                       cf_a.get_all())
+        self.assertEqual(       1,                                          cf_a.get('.b'))
+
+    def test_very_deep_names(self):
+        deep_a = '.'.join(['a'] * 1500)
+        deep_b = '.'.join(['b'] * 1500)
+        cf = ConfigFile(self.deep_file)
+        self.assertTrue(cf.load())
+        self.assertEqual(       [deep_a, deep_b + '.var1'],                 list(cf.get_all()))
+        self.assertEqual(       'bottom',                                   cf.get(deep_a))
+        self.assertEqual(       'scoped',                                   cf.get(deep_b + '.var1'))
+        cf_a = cf.get('a')
+        self.assertEqual(       'bottom',                                   cf_a.get(deep_a[2:]))
+        self.assertEqual(       [deep_a[2:]],                               list(cf_a.get_all()))
+
+    def test_get_all_in_file_order(self):
+        cf = ConfigFile(self.test1_file)
+        self.assertTrue(cf.load())
+        names = list(cf.get_all())
+        self.assertEqual(       ['var1', 'var2', 'var_3', 'VAR-4'],         names[:4])
+        self.assertEqual(       ['sql.maria.auth.db', 'var15', 'var16'],    names[-3:])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conf_file = os.path.join(tmp_dir, "order.conf")
+            with open(conf_file, 'w', encoding='utf8') as conf:
+                conf.write('a.x = 1\nb = 2\na.y = 3\n[a]\nz.q = 4\nw = 5\n[]\nb = 6\n')
+            cf = ConfigFile(conf_file)
+            cf.preload( { "c": 0, "a.x": 0 } )
+            self.assertTrue(cf.load())
+        self.assertEqual(       ['c', 'a.x', 'b', 'a.y', 'a.z.q', 'a.w'],   list(cf.get_all()))
+        self.assertEqual(       ['x', 'y', 'z.q', 'w'],                     list(cf.get('a').get_all()))
+        # names keep the delimiter they were added with
+        cf._override_scope_delimiter(":")
+        self.assertEqual(       ['c', 'a.x', 'b', 'a.y', 'a.z.q', 'a.w'],   list(cf.get_all()))
+        self.assertEqual(       ['2', '6'],                                 cf.get_all()['b'])
+
+    def test_override_no_comment_starts(self):
+        cf = ConfigFile(self.nocomments_file)
+        cf._override_comment_starts([])
+        self.assertTrue(cf.load())
+        self.assertEqual(       'value # not a comment',                    cf.get('var1'))
+        self.assertEqual(       'http://example.com',                       cf.get('var2'))
+        self.assertEqual(       '"quoted" # not a comment either',          cf.get('var3'))
+
+    def test_pickle(self):
+        cf = ConfigFile(self.test1_file)
+        self.assertTrue(cf.load())
+        unpickled = pickle.loads(pickle.dumps(cf))
+        self.assertEqual(       cf.get_all(),                               unpickled.get_all())
+        self.assertEqual(       'apache',                                   unpickled.get('sql').get('maria.auth.user'))
+        for subclass in (SlottedConfigFile, PlainConfigFile):
+            sub_cf = subclass(self.test1_file)
+            self.assertTrue(sub_cf.load())
+            sub_cf.extra = 'kept'
+            for copied in (pickle.loads(pickle.dumps(sub_cf)), copy.copy(sub_cf)):
+                self.assertIsInstance(copied, subclass)
+                self.assertEqual(       'kept',                             copied.extra)
+                self.assertEqual(       'apache',                           copied.get('sql.maria.auth.user'))
+
+    def test_weakref(self):
+        cf = ConfigFile()
+        self.assertIs(cf, weakref.ref(cf)())
+
+    def test_override_comment_start_string(self):
+        cf = ConfigFile(self.comments_file)
+        cf._override_comment_starts(";;")
+        self.assertEqual(       [';;'],                                     cf.line_comment_start)
+        self.assertTrue(cf.load())
+        self.assertEqual(       'value',                                    cf.get('var1'))
+        self.assertEqual(       'quoted ;; not a comment',                  cf.get('var2'))
+        self.assertEqual(       'hash # not a comment',                     cf.get('var3'))
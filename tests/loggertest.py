@@ -5,6 +5,8 @@ import time
 from nofus import Logger, LoggingInterface
 
 MEMLOGS = []
+# Timestamp prefix at the start of each log line
+TIMESTAMP_RE = re.compile(r'^\[[^[]+\]', re.M)
 
 class CustomLogger(LoggingInterface):
     def __init__(self, log_file=None, log_level=None):
@@ -17,25 +19,20 @@ class CustomLogger(LoggingInterface):
         global MEMLOGS
         if (self.log_level & log_level) != Logger.LOG_NONE:
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            level = "CUSTOM"
-            if log_level == Logger.LOG_CRITICAL:
-                level = "CRITICAL"
-            elif log_level == Logger.LOG_ERROR:
-                level = "ERROR"
-            elif log_level == Logger.LOG_WARNING:
-                level = "WARNING"
-            elif log_level == Logger.LOG_NOTICE:
-                level = "NOTICE"
-            elif log_level == Logger.LOG_INFO:
-                level = "INFO"
-            elif log_level == Logger.LOG_DEBUG:
-                level = "DEBUG"
-            elif log_level == Logger.LOG_TRACE:
-                level = "TRACE"
-
-            entry = "[{0}] {1}".format(level, entry)
+            level = Logger.LEVEL_NAMES.get(log_level, "CUSTOM")
+
+            entry = f"[{level}] {entry}"
             MEMLOGS.append(entry)
 
+class BridgeLogger(LoggingInterface):
+    def __init__(self):
+        # a level in some other scheme, not a Logger bitmask
+        self.log_level = "INFO"
+        self.entries = []
+
+    def make_log(self, entry, log_level):
+        self.entries.append(entry)
+
 class LoggerTestCase(unittest.TestCase):
     def setUp(self):
         self.log_file = '/tmp/.nofus_test.log'
@@ -79,8 +76,7 @@ class LoggerTestCase(unittest.TestCase):
         log_content = ""
         with open(self.log_file, 'r') as logread:
             log_content = logread.read(1024)
-        log_content = re.sub('^\[[^[]+\]', "[TS]", log_content)
-        log_content = re.sub(os.linesep + '\[[^[]+\]', os.linesep + "[TS]", log_content)
+        log_content = TIMESTAMP_RE.sub("[TS]", log_content)
         self.assertIsNotNone(log_content)
         self.assertTrue(log_content.startswith(valid_log))
         self.assertTrue(log_content.endswith(
@@ -89,6 +85,35 @@ class LoggerTestCase(unittest.TestCase):
             os.linesep
         ))
 
+    def test_moved_log_file(self):
+        moved_file = self.log_file + ".1"
+        Logger.initialize(self.log_file)
+        Logger.error("Before move.")
+        os.rename(self.log_file, moved_file)
+        Logger.error("After move.")
+        Logger.disable()
+
+        with open(moved_file, 'r') as logread:
+            moved_content = logread.read()
+        os.unlink(moved_file)
+        with open(self.log_file, 'r') as logread:
+            log_content = logread.read()
+        self.assertTrue(moved_content.endswith("Before move." + os.linesep))
+        self.assertTrue(log_content.endswith("After move." + os.linesep))
+        self.assertNotIn("After move.", moved_content)
+
+    def test_closed_logger(self):
+        Logger.initialize(self.log_file)
+        logger = Logger.logger
+        Logger.disable()
+        # e.g. another thread logging through the logger it got before the disable
+        logger.make_log("After close.", Logger.LOG_ERROR)
+        self.assertIsNone(logger.log_handle)
+
+        with open(self.log_file, 'r') as logread:
+            log_content = logread.read()
+        self.assertTrue(log_content.endswith("After close." + os.linesep))
+
     def test_custom_logger(self):
         Logger.register(CustomLogger())
         Logger.trace("Trace!");
@@ -103,3 +128,10 @@ class LoggerTestCase(unittest.TestCase):
         self.assertEqual("[ERROR] Error!", MEMLOGS[0]);
         self.assertEqual("[CRITICAL] Critical!", MEMLOGS[1]);
 
+    def test_custom_logger_filters_itself(self):
+        bridge = BridgeLogger()
+        Logger.register(bridge)
+        Logger.error("Error!")
+        Logger.critical("Critical!")
+        Logger.disable()
+        self.assertEqual(["Error!", "Critical!"], bridge.entries)